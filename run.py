@@ -1,5 +1,5 @@
 import argparse
-import multiprocessing
+import asyncio
 from pathlib import Path
 from src.simulator import MachineSimulator
 from src.processor import DataProcessor
@@ -14,41 +14,33 @@ def run_processor(input_file: Path, last_processed_file: Path):
     processor = DataProcessor(input_file, last_processed_file)
     processor.run()
 
+async def run_all(stream_file: Path, last_processed_file: Path):
+    # Both components are I/O bound, so they share a single event loop.
+    # The processor still follows the stream file, which also receives
+    # status updates posted through the API.
+    simulator = MachineSimulator(stream_file)
+    processor = DataProcessor(stream_file, last_processed_file)
+    await asyncio.gather(simulator.run_async(), processor.run_async())
+
 def main():
     parser = argparse.ArgumentParser(description='Run machine monitoring system')
     parser.add_argument('--simulator-only', action='store_true',
                        help='Run only the simulator')
     parser.add_argument('--processor-only', action='store_true',
                        help='Run only the processor')
-    
+
     args = parser.parse_args()
-    
+
     if args.simulator_only:
         run_simulator(STREAM_FILE)
     elif args.processor_only:
         run_processor(STREAM_FILE, LAST_PROCESSED_FILE)
     else:
-        # Run both simulator and processor in parallel
-        simulator_process = multiprocessing.Process(
-            target=run_simulator,
-            args=(STREAM_FILE,)
-        )
-        processor_process = multiprocessing.Process(
-            target=run_processor,
-            args=(STREAM_FILE, LAST_PROCESSED_FILE)
-        )
-        
-        simulator_process.start()
-        processor_process.start()
-        
+        # Run both simulator and processor concurrently in this process
         try:
-            simulator_process.join()
-            processor_process.join()
+            asyncio.run(run_all(STREAM_FILE, LAST_PROCESSED_FILE))
         except KeyboardInterrupt:
-            simulator_process.terminate()
-            processor_process.terminate()
-            simulator_process.join()
-            processor_process.join()
+            pass
 
 if __name__ == "__main__":
     main()
@@ -6,6 +6,7 @@ setup(
     packages=find_packages(),
     install_requires=[
         "numpy",
+        "orjson",
         "python-json-logger",
         "python-dotenv",
         "pandas",
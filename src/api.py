@@ -1,16 +1,38 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request
 from flask_restful import Api, Resource
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 from datetime import datetime
-import pandas as pd
-import json
 from pathlib import Path
+import csv
+import orjson
 
-from src.config import PARAMETERS, ANALYSIS_CSV, STREAM_FILE
+from src.config import PARAMETERS, ANALYSIS_CSV, LATEST_ANALYSIS_FILE, STREAM_FILE
+from src.utils import read_last_line
 
 app = Flask(__name__)
 api = Api(app)
 
+# Latest analysis, keyed on the source file's (path, mtime, size)
+_analysis_cache: Optional[Tuple[Tuple[Path, int, int], Optional[Dict[str, Any]]]] = None
+
+
+def json_response(payload: Any, status: int = 200, headers: Optional[Dict[str, str]] = None) -> Response:
+    """Build a JSON response serialized with orjson."""
+    response = app.response_class(
+        orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_SORT_KEYS),
+        status=status,
+        mimetype='application/json'
+    )
+    if headers:
+        response.headers.extend(headers)
+    return response
+
+
+@api.representation('application/json')
+def output_json(data: Any, code: int, headers: Optional[Dict[str, str]] = None) -> Response:
+    """Serialize resource responses with orjson."""
+    return json_response(data, code, headers)
+
 
 def get_latest_stream_data() -> Optional[Dict[str, Any]]:
     """Read the latest data from the stream file."""
@@ -18,12 +40,61 @@ def get_latest_stream_data() -> Optional[Dict[str, Any]]:
         if not STREAM_FILE.exists():
             return None
             
-        last_line = STREAM_FILE.read_text().strip().split('\n')[-1]
-        return json.loads(last_line)
+        last_line = read_last_line(STREAM_FILE)
+        return orjson.loads(last_line) if last_line else None
             
     except Exception as e:
-        app.logger.error(f"Error reading stream file: {e}")
+        app.logger.error("Error reading stream file: %s", e)
+        return None
+
+
+def _parse_csv_value(value: str) -> Any:
+    """Convert a CSV field back to int, float or str."""
+    for cast in (int, float):
+        try:
+            return cast(value)
+        except ValueError:
+            pass
+    return value
+
+
+def read_last_csv_row(csv_file: Path) -> Optional[Dict[str, Any]]:
+    """Read the header and tail-read the last row of a CSV file."""
+    with csv_file.open('rb') as f:
+        header_line = f.readline()
+        has_rows = f.tell() < f.seek(0, 2)
+    
+    last_line = read_last_line(csv_file) if has_rows else None
+    if not last_line:
+        return None
+    
+    header = next(csv.reader([header_line.decode()]))
+    values = next(csv.reader([last_line.decode()]))
+    return {column: _parse_csv_value(value) for column, value in zip(header, values)}
+
+
+def get_latest_analysis() -> Optional[Dict[str, Any]]:
+    """Read the latest analysis snapshot, re-reading only when the file changes.
+    
+    Falls back to the last row of the analysis CSV until the processor has
+    written a snapshot, e.g. for data produced before snapshots existed.
+    """
+    global _analysis_cache
+    
+    source = LATEST_ANALYSIS_FILE if LATEST_ANALYSIS_FILE.exists() else ANALYSIS_CSV
+    if not source.exists():
         return None
+    
+    stat = source.stat()
+    key = (source, stat.st_mtime_ns, stat.st_size)
+    if _analysis_cache is None or _analysis_cache[0] != key:
+        if source == LATEST_ANALYSIS_FILE:
+            latest_data = orjson.loads(source.read_bytes())
+        else:
+            latest_data = read_last_csv_row(source)
+        _analysis_cache = (key, latest_data)
+    
+    return _analysis_cache[1]
 
 class MachineDataResource(Resource):
     def get(self):
@@ -33,30 +104,28 @@ class MachineDataResource(Resource):
             current_data = get_latest_stream_data()
             current_status = current_data['status'] if current_data else None
             
-            # Get processed data from CSV
-            if Path(ANALYSIS_CSV).exists():
-                df = pd.read_csv(ANALYSIS_CSV)
-                if not df.empty:
-                    latest_data = df.iloc[-1].to_dict()
-                    return jsonify({
-                        "success": True,
-                        "processed_data": latest_data,
-                        "current_status": current_status,
-                        "timestamp": current_data['timestamp'] if current_data else None
-                    })
+            # Get processed data from the latest analysis snapshot
+            latest_data = get_latest_analysis()
+            if latest_data:
+                return {
+                    "success": True,
+                    "processed_data": latest_data,
+                    "current_status": current_status,
+                    "timestamp": current_data['timestamp'] if current_data else None
+                }
             
-            return jsonify({
+            return {
                 "success": False,
                 "error": "No data available",
                 "current_status": current_status,
                 "timestamp": current_data['timestamp'] if current_data else None
-            })
+            }
         
         except Exception as e:
-            return jsonify({
+            return {
                 "success": False,
                 "error": str(e)
-            }), 500
+            }, 500
 
 class MachineStatusResource(Resource):
     def get(self):
@@ -64,7 +133,7 @@ class MachineStatusResource(Resource):
         current_data = get_latest_stream_data()
         
         if current_data:
-            return jsonify({
+            return {
                 "success": True,
                 "data": {
                     "status": current_data['status'],
@@ -72,12 +141,12 @@ class MachineStatusResource(Resource):
                     "temperature": current_data['temperature'],
                     "speed": current_data['speed']
                 }
-            })
+            }
         else:
-            return jsonify({
+            return {
                 "success": False,
                 "error": "No current data available"
-            }), 404
+            }, 404
     
     def post(self):
         """Update machine status."""
@@ -126,8 +195,8 @@ class MachineStatusResource(Resource):
             }
             
             # Append to stream file
-            with STREAM_FILE.open('a') as f:
-                f.write(json.dumps(new_data) + '\n')
+            with STREAM_FILE.open('ab') as f:
+                f.write(orjson.dumps(new_data) + b'\n')
             
             return {
                 "success": True,
@@ -147,17 +216,17 @@ api.add_resource(MachineStatusResource, '/status')
 # Error handlers
 @app.errorhandler(404)
 def not_found(error):
-    return jsonify({
+    return json_response({
         "success": False,
         "error": "Resource not found"
-    }), 404
+    }, 404)
 
 @app.errorhandler(500)
 def internal_error(error):
-    return jsonify({
+    return json_response({
         "success": False,
         "error": "Internal server error"
-    }), 500
+    }, 500)
 
 if __name__ == '__main__':
     app.run(debug=True, port=5000)
@@ -9,6 +9,7 @@ LOGS_DIR = PROJECT_ROOT / "logs"
 STREAM_FILE = DATA_DIR / "stream_output.jsonl"
 LAST_PROCESSED_FILE = DATA_DIR / "last_processed.txt"
 ANALYSIS_CSV = DATA_DIR / "analysis_output.csv"
+LATEST_ANALYSIS_FILE = DATA_DIR / "latest_analysis.json"
 
 # Ensure directories exist
 DATA_DIR.mkdir(exist_ok=True)
@@ -39,6 +40,10 @@ PARAMETERS = {
     }
 }
 
+# Integer codes for machine statuses (index into STATUS_NAMES)
+STATUS_NAMES = PARAMETERS['status']['possible_values']
+STATUS_CODES = {status: code for code, status in enumerate(STATUS_NAMES)}
+
 # Processing settings
 WINDOW_SIZE = 5
 SIMULATION_INTERVAL = 2  # seconds
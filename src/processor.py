@@ -1,190 +1,541 @@
-import json
-import time
+import os
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import IO, Callable, Dict, List, Any, NamedTuple, Optional, Tuple
 import numpy as np
-import pandas as pd
+import orjson
 
 from src.config import (
     PARAMETERS, PROCESSING_INTERVAL, WINDOW_SIZE,
-    STREAM_FILE, LAST_PROCESSED_FILE, ANALYSIS_CSV
+    STREAM_FILE, LAST_PROCESSED_FILE, ANALYSIS_CSV, LATEST_ANALYSIS_FILE,
+    STATUS_CODES, STATUS_NAMES
+)
+from src.utils import (
+    MovingStatsSeries, PeriodicComponent, setup_logger, calculate_moving_stats, calculate_moving_stats_series
 )
-from src.utils import setup_logger, calculate_moving_stats
 
 logger = setup_logger("processor")
 
+# Range bounds, resolved once at import time
+TEMP_EXP_LO, TEMP_EXP_HI = PARAMETERS['temperature']['expected_range']
+TEMP_ALERT_LO, TEMP_ALERT_HI = PARAMETERS['temperature']['alert_range']
+SPEED_EXP_LO, SPEED_EXP_HI = PARAMETERS['speed']['expected_range']
+SPEED_ALERT_LO, SPEED_ALERT_HI = PARAMETERS['speed']['alert_range']
+
+# Ticks with more new readings than this are analyzed in one vectorized
+# pass; smaller ticks update the running window state reading by reading
+BATCH_ANALYSIS_THRESHOLD = 10
+
+# Maximum bytes of the input file consumed per tick
+READ_CHUNK_SIZE = 4 << 20
+
+# Columns of the analysis CSV, in the order of flatten_analysis_for_csv
+CSV_COLUMNS = [
+    'timestamp', 'temperature_current', 'temperature_moving_avg', 'temperature_trend',
+    'speed_current', 'speed_moving_avg', 'speed_trend', 'status_current',
+    'status_mode_in_window', 'status_changes', 'health_score', 'alerts'
+]
+
+# The CSV schema is fixed, so rows are formatted directly instead of
+# going through a generic CSV writer
+CSV_HEADER = ','.join(CSV_COLUMNS) + '\n'
+CSV_ROW_FORMAT = ','.join(f'{{{column}}}' for column in CSV_COLUMNS) + '\n'
+
+
+def csv_quote(value: str) -> str:
+    """Quote a free-text CSV field only when it contains special characters."""
+    if any(char in value for char in ',"\r\n'):
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+
+def range_alert(label: str, value: float) -> str:
+    """Format the alert for a value outside its safe range."""
+    return f"{label} out of safe range: {value}"
+
+
+class RangeCheck(NamedTuple):
+    """Expected- and alert-range checks for one metric.
+    
+    check tests a single value and returns (is_outlier, alert or None);
+    check_batch returns (outlier mask, alert mask) for an array.
+    """
+    label: str
+    check: Callable[[float], Tuple[bool, Optional[str]]]
+    check_batch: Callable[[np.ndarray], Tuple[np.ndarray, np.ndarray]]
+
+
+def _make_range_check(label: str,
+                      expected_range: Tuple[float, float],
+                      alert_range: Tuple[float, float]) -> RangeCheck:
+    """Build the range checks for a metric with its bounds bound as closure constants."""
+    expected_lo, expected_hi = expected_range
+    alert_lo, alert_hi = alert_range
+    
+    def check(value: float) -> Tuple[bool, Optional[str]]:
+        alert = None if alert_lo <= value <= alert_hi else range_alert(label, value)
+        return not (expected_lo <= value <= expected_hi), alert
+    
+    def check_batch(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        return (
+            ~((expected_lo <= values) & (values <= expected_hi)),
+            ~((alert_lo <= values) & (values <= alert_hi)),
+        )
+    
+    return RangeCheck(label, check, check_batch)
+
+
+TEMPERATURE_CHECK = _make_range_check(
+    "Temperature", (TEMP_EXP_LO, TEMP_EXP_HI), (TEMP_ALERT_LO, TEMP_ALERT_HI)
+)
+SPEED_CHECK = _make_range_check(
+    "Speed", (SPEED_EXP_LO, SPEED_EXP_HI), (SPEED_ALERT_LO, SPEED_ALERT_HI)
+)
+
+# Alerts raised for statuses that may need attention, keyed by status code
+_STATUS_ALERTS = {
+    STATUS_CODES['PAUSED']: "Machine paused - may require attention",
+    STATUS_CODES['SHUTDOWN']: "Machine shutdown - check if scheduled",
+}
+
+# Status scores indexed by STATUS_CODES
+_STATUS_SCORES = np.array([
+    0.8,  # STARTED: starting up - good
+    1.0,  # RUNNING: running - optimal
+    0.6,  # PAUSED: not optimal but not bad
+    0.9,  # COMPLETED: good
+    0.5,  # SHUTDOWN: not optimal but might be intended
+])
+
 
-class DataProcessor:
+def compute_health_scores(temperatures: np.ndarray,
+                          speeds: np.ndarray,
+                          status_codes: np.ndarray) -> np.ndarray:
+    """Compute unrounded health scores for a batch of readings."""
+    temp_scores = np.maximum(0, 1 - np.abs(temperatures - 25) / 15)
+    speed_scores = np.maximum(0, 1 - np.abs(speeds - 1500) / 700)
+    return (temp_scores + speed_scores + _STATUS_SCORES[status_codes]) / 3
+
+
+def compute_status_windows(status_codes: np.ndarray,
+                           window_size: int,
+                           start: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Compute the status mode and number of distinct statuses in the window
+    ending at each position from start onwards."""
+    positions = np.arange(start, len(status_codes))
+    lo = np.maximum(positions - window_size + 1, 0)
+    
+    # Per-code counts over any window are differences of cumulative counts
+    one_hot = status_codes[:, None] == np.arange(len(STATUS_NAMES))
+    cumulative = np.concatenate((
+        np.zeros((1, len(STATUS_NAMES)), dtype=np.int64),
+        np.cumsum(one_hot, axis=0)
+    ))
+    counts = cumulative[positions + 1] - cumulative[lo]
+    return counts.argmax(axis=1), np.count_nonzero(counts, axis=1)
+
+
+@dataclass
+class ReadingBatch:
+    """Column-oriented batch of stream readings."""
+    timestamps: np.ndarray
+    temperatures: np.ndarray
+    speeds: np.ndarray
+    status_codes: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+
+class DataProcessor(PeriodicComponent):
+    description = "data processor"
+    interval = PROCESSING_INTERVAL
+    logger = logger
+    
     def __init__(self, 
                  input_file: Path,
                  last_processed_file: Path,
                  output_csv: Path = ANALYSIS_CSV,
-                 window_size: int = WINDOW_SIZE):
+                 window_size: int = WINDOW_SIZE,
+                 latest_file: Path = LATEST_ANALYSIS_FILE):
         self.input_file = input_file
         self.last_processed_file = last_processed_file
         self.output_csv = output_csv
+        self.latest_file = latest_file
         self.window_size = window_size
         self.running = False
+        
+        # CSV output is opened on first write and kept open
+        self._csv_file: Optional[IO[str]] = None
 
-        # Initialize data buffers
-        self.temp_buffer: List[float] = []
-        self.speed_buffer: List[float] = []
-        self.status_buffer: List[str] = []
+        # Initialize fixed-size ring buffers. Each value is written twice
+        # (at i and i + window_size) so the window is always a contiguous slice.
+        self.temp_buffer = np.empty(2 * window_size, dtype=np.float64)
+        self.speed_buffer = np.empty(2 * window_size, dtype=np.float64)
+        self.status_buffer = np.empty(2 * window_size, dtype=np.int8)
+        self._idx = 0
+        self._count = 0
+        
+        # Running sums of the buffered windows and per-code status counts
+        self.temp_sum = 0.0
+        self.speed_sum = 0.0
+        self.status_counts = np.zeros(len(STATUS_NAMES), dtype=np.int64)
 
-        # Load last processed timestamp
-        self.last_processed = self.load_last_processed()
+        # Load the byte offset into the input file. Checkpoints written before
+        # the offset was stored only hold a timestamp, so on the first pass
+        # readings up to that timestamp are skipped instead.
+        timestamp, offset = self.load_last_processed()
+        self._file_offset = offset or 0
+        self._skip_until = timestamp if offset is None else None
 
     
-    def load_last_processed(self) -> Optional[datetime]:
-        """Load the last processed timestamp from file."""
+    def load_last_processed(self) -> Tuple[Optional[str], Optional[int]]:
+        """Load the last processed ISO timestamp and input file offset from file.
+        
+        Either value is None when it is missing or invalid.
+        """
         try:
-            if self.last_processed_file.exists():
-                timestamp_str = self.last_processed_file.read_text().strip()
-                return datetime.fromisoformat(timestamp_str)
+            if not self.last_processed_file.exists():
+                return None, None
+            timestamp_str, _, offset_str = self.last_processed_file.read_text().strip().partition('\n')
         except Exception as e:
-            logger.error(f"Error loading last processed timestamp: {e}")
-        return None
+            logger.error("Error loading last processed timestamp: %s", e)
+            return None, None
+        
+        offset = int(offset_str) if offset_str.isdigit() else None
+        try:
+            datetime.fromisoformat(timestamp_str)  # Validate once on load
+        except ValueError as e:
+            logger.error("Error loading last processed timestamp: %s", e)
+            timestamp_str = None
+        return timestamp_str, offset
 
     
-    def save_last_processed(self, timestamp: datetime):
-        """Save the last processed timestamp to file."""
+    def save_last_processed(self, timestamp: str):
+        """Save the last processed ISO timestamp and input file offset to file."""
         try:
-            self.last_processed_file.write_text(timestamp.isoformat())
+            self.last_processed_file.write_text(f"{timestamp}\n{self._file_offset}")
         except Exception as e:
-            logger.error(f"Error saving last processed timestamp: {e}")
+            logger.error("Error saving last processed timestamp: %s", e)
 
     
-    def process_new_readings(self) -> List[Dict[str, Any]]:
-        """Process new readings from the input file."""
-        new_readings = []
+    def process_new_readings(self) -> ReadingBatch:
+        """Process new readings from the input file into a columnar batch."""
+        timestamps: List[str] = []
+        temperatures: List[float] = []
+        speeds: List[float] = []
+        status_codes: List[int] = []
         
         try:
-            with self.input_file.open('r') as f:
-                for line in f:
-                    reading = json.loads(line.strip())
-                    timestamp = datetime.fromisoformat(reading['timestamp'])
-                    
-                    if self.last_processed and timestamp <= self.last_processed:
-                        continue
-                        
-                    new_readings.append(reading)
-                    self.last_processed = timestamp
+            for line in self._read_new_lines():
+                self._file_offset += len(line) + 1
+                
+                if not line.strip():
+                    continue
+                
+                # Validate every field before appending any, so a malformed
+                # line is skipped without leaving the columns uneven
+                try:
+                    reading = orjson.loads(line)
+                    timestamp = reading['timestamp']
+                    temperature = float(reading['temperature'])
+                    speed = float(reading['speed'])
+                    status = reading['status']
+                    status_code = STATUS_CODES.get(status)
+                    already_processed = (
+                        self._skip_until is not None and timestamp <= self._skip_until
+                    )
+                except (ValueError, KeyError, TypeError) as e:
+                    logger.error("Skipping malformed reading: %s", e)
+                    continue
+                if already_processed:
+                    continue
+                # The stream is chronological, so the offset alone tracks
+                # progress from the first newer reading on
+                self._skip_until = None
+                if status_code is None:
+                    logger.error("Skipping reading with unknown status: %s", status)
+                    continue
+                
+                # The offset already guarantees each line is read once
+                timestamps.append(timestamp)
+                temperatures.append(temperature)
+                speeds.append(speed)
+                status_codes.append(status_code)
         except Exception as e:
-            logger.error(f"Error reading new data: {e}")
+            logger.error("Error reading new data: %s", e)
             
-        return new_readings
+        return ReadingBatch(
+            timestamps=np.array(timestamps, dtype=np.str_),
+            temperatures=np.array(temperatures, dtype=np.float64),
+            speeds=np.array(speeds, dtype=np.float64),
+            status_codes=np.array(status_codes, dtype=np.int8)
+        )
 
 
-    def update_buffers(self, readings: List[Dict[str, Any]]):
-        """Update data buffers with new readings."""
-        for reading in readings:
-            self.temp_buffer.append(reading['temperature'])
-            self.speed_buffer.append(reading['speed'])
-            self.status_buffer.append(reading['status'])
+    def _read_new_lines(self) -> List[bytes]:
+        """Read the complete lines appended to the input file since the saved offset.
+        
+        At most READ_CHUNK_SIZE bytes are consumed per call; the rest of a
+        large backlog, and a partially written last line, are left for the
+        next call. The file is read with os.pread rather than mapped, so a
+        concurrent truncation can only shorten the read.
+        """
+        fd = os.open(self.input_file, os.O_RDONLY)
+        try:
+            # Start over if the input file was truncated or replaced
+            if os.fstat(fd).st_size < self._file_offset:
+                self._file_offset = 0
             
-            # Keep only window_size elements
-            self.temp_buffer = self.temp_buffer[-self.window_size:]
-            self.speed_buffer = self.speed_buffer[-self.window_size:]
-            self.status_buffer = self.status_buffer[-self.window_size:]
-
-
-    def calculate_health_score(self, current_reading: Dict[str, Any]) -> float:
-        """Calculate overall health score based on all parameters."""
-        # Base scores from temperature and speed
-        temp_score = max(0, 1 - abs(current_reading['temperature'] - 25) / 15)
-        speed_score = max(0, 1 - abs(current_reading['speed'] - 1500) / 700)
-        
-        # Status score
-        status_scores = {
-            'STARTED': 0.8,   # Starting up - good
-            'RUNNING': 1.0,   # Running - optimal
-            'PAUSED': 0.6,    # Paused - not optimal but not bad
-            'COMPLETED': 0.9, # Completed - good
-            'SHUTDOWN': 0.5   # Shutdown - not optimal but might be intended
-        }
-        status_score = status_scores.get(current_reading['status'], 0.5)
+            data = os.pread(fd, READ_CHUNK_SIZE, self._file_offset)
+            end = data.rfind(b'\n') + 1
+            # A single line longer than the chunk size is read up to its end
+            while data and not end:
+                chunk = os.pread(fd, READ_CHUNK_SIZE, self._file_offset + len(data))
+                if not chunk:
+                    break
+                newline = chunk.find(b'\n')
+                if newline >= 0:
+                    end = len(data) + newline + 1
+                data += chunk
+        finally:
+            os.close(fd)
         
-        return round((temp_score + speed_score + status_score) / 3, 2)
+        return data[:end - 1].split(b'\n') if end else []
 
 
-    def process_and_analyze(self) -> Optional[Dict[str, Any]]:
-        """Process recent readings and generate analysis."""
-        readings = self.process_new_readings()
-        if not readings:
-            return None
-            
-        self.update_buffers(readings)
-        current_reading = readings[-1]
-        
-        # Convert lists to numpy arrays for calculations
-        temp_array = np.array(self.temp_buffer)
-        speed_array = np.array(self.speed_buffer)
-        
-        temp_stats = calculate_moving_stats(temp_array, self.window_size)
-        speed_stats = calculate_moving_stats(speed_array, self.window_size)
-        
-        # Calculate status mode
-        status_mode = max(set(self.status_buffer), key=self.status_buffer.count)
-
-        analysis = {
-            "timestamp": current_reading['timestamp'],
-            "window_stats": {
-                "temperature": {
-                    "current": current_reading['temperature'],
-                    "moving_avg": temp_stats['moving_avg'],
-                    "is_outlier": not (
-                        PARAMETERS['temperature']['expected_range'][0]
-                        <= current_reading['temperature']
-                        <= PARAMETERS['temperature']['expected_range'][1]
-                    ),
-                    "trend": temp_stats['trend']
-                },
-                "speed": {
-                    "current": current_reading['speed'],
-                    "moving_avg": speed_stats['moving_avg'],
-                    "is_outlier": not (
-                        PARAMETERS['speed']['expected_range'][0]
-                        <= current_reading['speed']
-                        <= PARAMETERS['speed']['expected_range'][1]
-                    ),
-                    "trend": speed_stats['trend']
+    def update_buffers(self, batch: ReadingBatch):
+        """Update data buffers with new readings."""
+        # Older readings would be overwritten within this call anyway
+        n = min(len(batch), self.window_size)
+        if n == 0:
+            return
+        
+        i = (self._idx + np.arange(n)) % self.window_size
+        j = i + self.window_size
+        
+        self.temp_buffer[i] = self.temp_buffer[j] = batch.temperatures[-n:]
+        self.speed_buffer[i] = self.speed_buffer[j] = batch.speeds[-n:]
+        self.status_buffer[i] = self.status_buffer[j] = batch.status_codes[-n:]
+        
+        self._idx = (self._idx + n) % self.window_size
+        self._count = min(self._count + n, self.window_size)
+        self.resync_window_state()
+
+
+    def push_reading(self, temperature: float, speed: float, status_code: int):
+        """Add a single reading to the buffers, sliding the running state in O(1)."""
+        i = self._idx
+        j = i + self.window_size
+        
+        # Drop the evicted reading once the window is full
+        if self._count == self.window_size:
+            self.temp_sum -= self.temp_buffer[i]
+            self.speed_sum -= self.speed_buffer[i]
+            self.status_counts[self.status_buffer[i]] -= 1
+        else:
+            self._count += 1
+        
+        self.temp_buffer[i] = self.temp_buffer[j] = temperature
+        self.speed_buffer[i] = self.speed_buffer[j] = speed
+        self.status_buffer[i] = self.status_buffer[j] = status_code
+        self.temp_sum += temperature
+        self.speed_sum += speed
+        self.status_counts[status_code] += 1
+        
+        self._idx = (i + 1) % self.window_size
+        # Re-sum once per lap so floating-point drift cannot accumulate
+        if self._idx == 0:
+            self.resync_window_state()
+
+
+    def resync_window_state(self):
+        """Recompute the running sums and status counts from the buffers."""
+        self.temp_sum = float(self.get_window(self.temp_buffer).sum())
+        self.speed_sum = float(self.get_window(self.speed_buffer).sum())
+        self.status_counts = np.bincount(
+            self.get_window(self.status_buffer), minlength=len(STATUS_NAMES)
+        )
+
+
+    def get_window(self, buffer: np.ndarray) -> np.ndarray:
+        """Return a view of the buffered values in chronological order."""
+        if self._count < self.window_size:
+            return buffer[:self._count]
+        return buffer[self._idx:self._idx + self.window_size]
+
+
+    def calculate_health_score(self, batch: ReadingBatch) -> List[float]:
+        """Calculate overall health scores based on all parameters."""
+        scores = compute_health_scores(batch.temperatures, batch.speeds, batch.status_codes)
+        return [round(score, 2) for score in scores.tolist()]
+
+
+    def process_and_analyze(self) -> List[Dict[str, Any]]:
+        """Process new readings and generate one analysis per reading."""
+        batch = self.process_new_readings()
+        if not len(batch):
+            return []
+        
+        if len(batch) > BATCH_ANALYSIS_THRESHOLD:
+            temp_stats, speed_stats, status_modes, status_changes = self._analyze_batch(batch)
+            temp_outliers, temp_alerts, speed_outliers, speed_alerts = self._check_readings(batch)
+            temp_outliers, speed_outliers = temp_outliers.tolist(), speed_outliers.tolist()
+            alerts = self.generate_alerts(batch, temp_alerts, speed_alerts)
+        else:
+            temp_stats, speed_stats, status_modes, status_changes = self._analyze_incremental(batch)
+            temp_outliers, speed_outliers, alerts = zip(*(
+                self._check_reading(temperature, speed, status_code)
+                for temperature, speed, status_code in zip(
+                    batch.temperatures.tolist(), batch.speeds.tolist(), batch.status_codes.tolist())
+            ))
+        
+        analyses = []
+        for (timestamp, temperature, temp_avg, temp_outlier, temp_trend,
+             speed, speed_avg, speed_outlier, speed_trend,
+             status_code, status_mode, changes, health_score, reading_alerts) in zip(
+                batch.timestamps.tolist(),
+                batch.temperatures.tolist(), temp_stats.moving_avg,
+                temp_outliers, temp_stats.trend,
+                batch.speeds.tolist(), speed_stats.moving_avg,
+                speed_outliers, speed_stats.trend,
+                batch.status_codes.tolist(), status_modes, status_changes,
+                self.calculate_health_score(batch), alerts):
+            analyses.append({
+                "timestamp": timestamp,
+                "window_stats": {
+                    "temperature": {
+                        "current": temperature,
+                        "moving_avg": temp_avg,
+                        "is_outlier": temp_outlier,
+                        "trend": temp_trend
+                    },
+                    "speed": {
+                        "current": speed,
+                        "moving_avg": speed_avg,
+                        "is_outlier": speed_outlier,
+                        "trend": speed_trend
+                    },
+                    "status": {
+                        "current": STATUS_NAMES[status_code],
+                        "mode": STATUS_NAMES[status_mode],
+                        "changes_in_window": changes
+                    }
                 },
-                "status": {
-                    "current": current_reading['status'],
-                    "mode": status_mode,
-                    "changes_in_window": len(set(self.status_buffer))
+                "analysis": {
+                    "health_score": health_score,
+                    "alerts": reading_alerts
                 }
-            },
-            "analysis": {
-                "health_score": self.calculate_health_score(current_reading),
-                "alerts": self.generate_alerts(current_reading)
-            }
-        }
+            })
         
-        return analysis
+        return analyses
 
 
-    def generate_alerts(self, reading: Dict[str, Any]) -> List[str]:
-        """Generate alerts based on current readings."""
-        alerts = []
+    def _analyze_incremental(self, batch: ReadingBatch) -> Tuple[MovingStatsSeries, MovingStatsSeries, List[int], List[int]]:
+        """Compute per-reading window stats by sliding the running state one reading at a time."""
+        temp_avgs: List[float] = []
+        temp_trends: List[str] = []
+        speed_avgs: List[float] = []
+        speed_trends: List[str] = []
+        status_modes: List[int] = []
+        status_changes: List[int] = []
         
-        # Temperature and speed alerts
-        if not (PARAMETERS['temperature']['alert_range'][0]
-                <= reading['temperature']
-                <= PARAMETERS['temperature']['alert_range'][1]):
-            alerts.append(f"Temperature out of safe range: {reading['temperature']}")
+        for temperature, speed, status_code in zip(
+                batch.temperatures.tolist(), batch.speeds.tolist(), batch.status_codes.tolist()):
+            self.push_reading(temperature, speed, status_code)
             
-        if not (PARAMETERS['speed']['alert_range'][0]
-                <= reading['speed']
-                <= PARAMETERS['speed']['alert_range'][1]):
-            alerts.append(f"Speed out of safe range: {reading['speed']}")
+            temp_stats = calculate_moving_stats(
+                self.get_window(self.temp_buffer), self.window_size, window_sum=self.temp_sum
+            )
+            speed_stats = calculate_moving_stats(
+                self.get_window(self.speed_buffer), self.window_size, window_sum=self.speed_sum
+            )
+            temp_avgs.append(temp_stats.moving_avg)
+            temp_trends.append(temp_stats.trend)
+            speed_avgs.append(speed_stats.moving_avg)
+            speed_trends.append(speed_stats.trend)
+            
+            # Status mode from the incrementally maintained per-code counts
+            status_modes.append(int(self.status_counts.argmax()))
+            status_changes.append(int(np.count_nonzero(self.status_counts)))
+        
+        return (
+            MovingStatsSeries(moving_avg=temp_avgs, trend=temp_trends),
+            MovingStatsSeries(moving_avg=speed_avgs, trend=speed_trends),
+            status_modes,
+            status_changes
+        )
+
+
+    def _analyze_batch(self, batch: ReadingBatch) -> Tuple[MovingStatsSeries, MovingStatsSeries, List[int], List[int]]:
+        """Compute per-reading window stats for a large batch in one vectorized pass."""
+        # Prepend the buffered window so every new reading sees its full window
+        start = self._count
+        temperatures = np.concatenate((self.get_window(self.temp_buffer), batch.temperatures))
+        speeds = np.concatenate((self.get_window(self.speed_buffer), batch.speeds))
+        status_codes = np.concatenate((self.get_window(self.status_buffer), batch.status_codes))
+        self.update_buffers(batch)
+        
+        status_modes, status_changes = compute_status_windows(status_codes, self.window_size, start)
+        return (
+            calculate_moving_stats_series(temperatures, self.window_size, start),
+            calculate_moving_stats_series(speeds, self.window_size, start),
+            status_modes.tolist(),
+            status_changes.tolist()
+        )
+
+
+    def _check_reading(self, temperature: float, speed: float, status_code: int) -> Tuple[bool, bool, List[str]]:
+        """Run all checks for a single reading.
+        
+        Returns (temperature outlier, speed outlier, alerts).
+        """
+        temp_outlier, temp_alert = TEMPERATURE_CHECK.check(temperature)
+        speed_outlier, speed_alert = SPEED_CHECK.check(speed)
+        alerts = [
+            alert for alert in (temp_alert, speed_alert, _STATUS_ALERTS.get(status_code)) if alert
+        ]
+        return temp_outlier, speed_outlier, alerts
+
+
+    def _check_readings(self, batch: ReadingBatch) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Run all range checks for a batch in one place.
+        
+        Returns masks of (temperature outliers, temperature alerts,
+        speed outliers, speed alerts).
+        """
+        return (
+            *TEMPERATURE_CHECK.check_batch(batch.temperatures),
+            *SPEED_CHECK.check_batch(batch.speeds),
+        )
+
+
+    def generate_alerts(self,
+                        batch: ReadingBatch,
+                        temp_alerts: Optional[np.ndarray] = None,
+                        speed_alerts: Optional[np.ndarray] = None) -> List[List[str]]:
+        """Generate alerts for a batch of readings.
+        
+        The temperature and speed alert masks from _check_readings can be
+        passed in to avoid repeating the range checks.
+        """
+        temperatures, speeds = batch.temperatures, batch.speeds
+        alerts: List[List[str]] = [[] for _ in range(len(batch))]
+        
+        # Temperature and speed alerts
+        if temp_alerts is None or speed_alerts is None:
+            _, temp_alerts, _, speed_alerts = self._check_readings(batch)
+        
+        for i in np.flatnonzero(temp_alerts):
+            alerts[i].append(range_alert(TEMPERATURE_CHECK.label, temperatures[i]))
+        for i in np.flatnonzero(speed_alerts):
+            alerts[i].append(range_alert(SPEED_CHECK.label, speeds[i]))
         
         # Status-specific alerts
-        if reading['status'] == 'PAUSED':
-            alerts.append("Machine paused - may require attention")
-        elif reading['status'] == 'SHUTDOWN':
-            alerts.append("Machine shutdown - check if scheduled")
+        for status, message in _STATUS_ALERTS.items():
+            for i in np.flatnonzero(batch.status_codes == status):
+                alerts[i].append(message)
 
         return alerts
 
@@ -210,44 +561,52 @@ class DataProcessor:
     def save_to_csv(self, analysis: Dict[str, Any]):
         """Save analysis results to CSV file."""
         try:
-            flattened_analysis = self.flatten_analysis_for_csv(analysis)
-            df = pd.DataFrame([flattened_analysis])
+            if self._csv_file is None:
+                self._csv_file = self.output_csv.open('a', newline='')
+                # Write headers only when starting a new file
+                if self._csv_file.tell() == 0:
+                    self._csv_file.write(CSV_HEADER)
             
-            # If file exists, append without headers
-            if self.output_csv.exists():
-                df.to_csv(self.output_csv, mode='a', header=False, index=False)
-            else:
-                # If file doesn't exist, create it with headers
-                df.to_csv(self.output_csv, mode='w', header=True, index=False)
-                
-            logger.info(f"Analysis saved to {self.output_csv}")
+            flattened_analysis = self.flatten_analysis_for_csv(analysis)
+            flattened_analysis['timestamp'] = csv_quote(flattened_analysis['timestamp'])
+            flattened_analysis['alerts'] = csv_quote(flattened_analysis['alerts'])
+            self._csv_file.write(CSV_ROW_FORMAT.format(**flattened_analysis))
+            self._csv_file.flush()
         except Exception as e:
-            logger.error(f"Error saving to CSV: {e}")
+            logger.error("Error saving to CSV: %s", e)
 
 
-    def run(self):
-        """Run the processor continuously."""
-        self.running = True
-        logger.info("Starting data processor...")
-        
+    def close(self):
+        """Close the CSV output file if it is open."""
+        if self._csv_file is not None:
+            self._csv_file.close()
+            self._csv_file = None
+
+
+    def save_latest_analysis(self, analysis: Dict[str, Any]):
+        """Atomically replace the latest-analysis snapshot read by the API."""
         try:
-            while self.running:
-                analysis = self.process_and_analyze()
-                if analysis:
-                    # Print to console
-                    print(json.dumps(analysis, indent=2))
-                    # Save to CSV
-                    self.save_to_csv(analysis)
-                    # Update last processed timestamp
-                    self.save_last_processed(datetime.fromisoformat(analysis['timestamp']))
-                time.sleep(PROCESSING_INTERVAL)
-        except KeyboardInterrupt:
-            logger.info("Stopping data processor...")
-            self.running = False
+            flattened_analysis = self.flatten_analysis_for_csv(analysis)
+            tmp_file = self.latest_file.with_suffix('.tmp')
+            tmp_file.write_bytes(orjson.dumps(flattened_analysis))
+            tmp_file.replace(self.latest_file)
         except Exception as e:
-            logger.error(f"Error in processor: {str(e)}", exc_info=True)
-            self.running = False
+            logger.error("Error saving latest analysis: %s", e)
+
 
+    def step(self):
+        """Analyze any new readings and persist the results."""
+        analyses = self.process_and_analyze()
+        if analyses:
+            for analysis in analyses:
+                # Print to console
+                print(orjson.dumps(analysis, option=orjson.OPT_INDENT_2).decode())
+                # Save to CSV
+                self.save_to_csv(analysis)
+            # Refresh the snapshot served by the API
+            self.save_latest_analysis(analyses[-1])
+            # Update last processed timestamp
+            self.save_last_processed(analyses[-1]['timestamp'])
 
 if __name__ == "__main__":
     processor = DataProcessor(input_file=STREAM_FILE, last_processed_file=LAST_PROCESSED_FILE)
@@ -1,45 +1,82 @@
-import json
-import time
-import random
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any
+from typing import IO, Dict, List, Any, Optional
+import numpy as np
+import orjson
 
 from src.config import PARAMETERS, SIMULATION_INTERVAL, STREAM_FILE
-from src.utils import setup_logger
+from src.utils import PeriodicComponent, setup_logger
 
 logger = setup_logger("simulator")
 
-class MachineSimulator:
+# Number of uniform random numbers drawn from the generator at a time
+RANDOM_BATCH_SIZE = 4096
+
+# Next-status rules per status: (probability, likely next status, otherwise).
+# An otherwise of None picks a random valid transition to another status.
+_STATUS_RULES = {
+    'SHUTDOWN': (1.0, 'STARTED', 'STARTED'),    # Always go to STARTED from SHUTDOWN
+    'STARTED': (0.9, 'RUNNING', 'SHUTDOWN'),    # Usually progress to RUNNING
+    'RUNNING': (0.9, 'RUNNING', None),          # Small chance to change status
+    'PAUSED': (0.8, 'RUNNING', 'SHUTDOWN'),     # Usually resume running
+    'COMPLETED': (0.7, 'STARTED', 'SHUTDOWN'),  # Start new cycle or shutdown
+}
+
+# Temperature and speed ranges per status: ((temp_lo, temp_hi), (speed_lo, speed_hi))
+_STATE_RANGES = {
+    'SHUTDOWN': ((15.0, 20.0), (0.0, 0.0)),         # Cooler and stopped when shutdown
+    'PAUSED': ((20.0, 25.0), (800.0, 1000.0)),      # Lower speed when paused
+    'RUNNING': ((25.0, 35.0), (1000.0, 2000.0)),    # Warmer when running
+    'STARTED': ((25.0, 35.0), (1000.0, 2000.0)),
+    'COMPLETED': ((20.0, 30.0), (800.0, 1200.0)),   # Slowing down
+}
+
+class MachineSimulator(PeriodicComponent):
+    description = "machine simulation"
+    interval = SIMULATION_INTERVAL
+    logger = logger
+    
     def __init__(self, output_file: Path):
         self.output_file = output_file
         self.running = False
         self.current_status = 'SHUTDOWN'  # Set the initial state as shutdown
+        
+        # Output is opened on first write and kept open; unbuffered so each
+        # reading reaches the file in a single append
+        self._output: Optional[IO[bytes]] = None
+        
+        # Random numbers are drawn in batches and handed out one at a time
+        self._rng = np.random.default_rng()
+        self._random_batch: List[float] = []
+        self._random_index = 0
+    
+    def _random(self) -> float:
+        """Return the next uniform random number in [0, 1)."""
+        if self._random_index == len(self._random_batch):
+            self._random_batch = self._rng.random(RANDOM_BATCH_SIZE).tolist()
+            self._random_index = 0
+        value = self._random_batch[self._random_index]
+        self._random_index += 1
+        return value
+    
+    def _uniform(self, low: float, high: float) -> float:
+        """Return a uniform random number in [low, high)."""
+        return low + (high - low) * self._random()
     
     def get_next_status(self) -> str:
         """Determine next status based on current status and valid transitions."""
-        valid_transitions = PARAMETERS['status']['transitions'][self.current_status]
-
-        if self.current_status == 'SHUTDOWN':
-            # Always go to STARTED from SHUTDOWN
-            return 'STARTED'
-        elif self.current_status == 'STARTED':
-            # Usually progress to RUNNING
-            return 'RUNNING' if random.random() < 0.9 else 'SHUTDOWN'
-        elif self.current_status == 'RUNNING':
-            # Small chance to change status in the valid status transition
-            if random.random() < 0.1:
-                possible_next = [s for s in valid_transitions if s != self.current_status]
-                return random.choice(possible_next)
-            return 'RUNNING'
-        elif self.current_status == 'PAUSED':
-            # Usually resume running, but Shuting down is also a possible transition
-            return 'RUNNING' if random.random() < 0.8 else 'SHUTDOWN'
-        elif self.current_status == 'COMPLETED':
-            # Start new cycle or shutdown
-            return 'STARTED' if random.random() < 0.7 else 'SHUTDOWN'
+        rule = _STATUS_RULES.get(self.current_status)
+        if rule is None:
+            return self.current_status
         
-        return self.current_status
+        probability, likely, otherwise = rule
+        if self._random() < probability:
+            return likely
+        if otherwise is None:
+            valid_transitions = PARAMETERS['status']['transitions'][self.current_status]
+            possible_next = [s for s in valid_transitions if s != self.current_status]
+            return possible_next[int(self._random() * len(possible_next))]
+        return otherwise
 
     def generate_reading(self) -> Dict[str, Any]:
         """Generate a single machine reading."""
@@ -48,18 +85,9 @@ class MachineSimulator:
         self.current_status = new_status
         
         # Generate temperature and speed based on status
-        if new_status == 'SHUTDOWN':
-            temp = random.uniform(15.0, 20.0)  # Cooler when shutdown
-            speed = 0
-        elif new_status == 'PAUSED':
-            temp = random.uniform(20.0, 25.0)
-            speed = random.uniform(800, 1000)  # Lower speed when paused
-        elif new_status in ['RUNNING', 'STARTED']:
-            temp = random.uniform(25.0, 35.0)  # Warmer when running
-            speed = random.uniform(1000, 2000)
-        else:  # COMPLETED
-            temp = random.uniform(20.0, 30.0)
-            speed = random.uniform(800, 1200)  # Slowing down
+        (temp_lo, temp_hi), (speed_lo, speed_hi) = _STATE_RANGES[new_status]
+        temp = self._uniform(temp_lo, temp_hi)
+        speed = self._uniform(speed_lo, speed_hi)
             
         return {
             "timestamp": datetime.now().isoformat(),
@@ -70,27 +98,23 @@ class MachineSimulator:
 
     def write_reading(self, reading: Dict[str, Any]):
         """Write reading to both file and stdout."""
-        with self.output_file.open('a') as f:
-            json_line = json.dumps(reading)
-            f.write(json_line + '\n')
-            print(f"{json_line}")
-    
-    def run(self):
-        """Run the simulation continuously."""
-        self.running = True
-        logger.info("Starting machine simulation...")
+        if self._output is None:
+            self._output = self.output_file.open('ab', buffering=0)
         
-        try:
-            while self.running:
-                reading = self.generate_reading()
-                self.write_reading(reading)
-                time.sleep(SIMULATION_INTERVAL)
-        except KeyboardInterrupt:
-            logger.info("Stopping machine simulation...")
-            self.running = False
-        except Exception as e:
-            logger.error(f"Error in simulation: {str(e)}", exc_info=True)
-            self.running = False
+        json_line = orjson.dumps(reading)
+        self._output.write(json_line + b'\n')
+        print(json_line.decode())
+    
+    def close(self):
+        """Close the output file if it is open."""
+        if self._output is not None:
+            self._output.close()
+            self._output = None
+    
+    def step(self):
+        """Generate one reading and write it out."""
+        reading = self.generate_reading()
+        self.write_reading(reading)
 
 if __name__ == "__main__":
     output_path = Path(STREAM_FILE)
@@ -1,10 +1,11 @@
+import asyncio
 import logging
 from datetime import datetime
 from logging.handlers import RotatingFileHandler
 from pathlib import Path
 from pythonjsonlogger import jsonlogger
 import numpy as np
-from typing import List, Dict, Any, Optional
+from typing import List, NamedTuple, Optional
 from src.config import LOGS_DIR
 
 
@@ -30,33 +31,139 @@ def setup_logger(name: str) -> logging.Logger:
     return logger
 
 
-def calculate_moving_stats(values: np.ndarray, window_size: int = 5) -> Dict[str, Any]:
-    """Calculate moving average for numerical data."""
-    if len(values) == 0:
-        return {
-            "moving_avg": np.nan,
-            "trend": "insufficient_data"
-        }
+def read_last_line(file_path: Path, block_size: int = 8192) -> Optional[bytes]:
+    """Read the last non-empty line of a file by seeking to its tail."""
+    with file_path.open('rb') as f:
+        size = f.seek(0, 2)
+        window = block_size
+        
+        while True:
+            start = max(0, size - window)
+            f.seek(start)
+            lines = f.read(size - start).rstrip().split(b'\n')
+            
+            # The last line is complete once a newline precedes it
+            if len(lines) > 1 or start == 0:
+                return lines[-1] or None
+            window *= 2
+
+
+class PeriodicComponent:
+    """Base for components that call step() repeatedly at a fixed interval.
+    
+    Subclasses set description, interval and logger and implement step();
+    close() is called once the loop stops.
+    """
+    description = "component"
+    interval = 1.0
+    logger = logging.getLogger(__name__)
+    running = False
+    
+    def step(self):
+        """Do one unit of work."""
+        raise NotImplementedError
+    
+    def close(self):
+        """Release resources held by the component."""
+    
+    def run(self):
+        """Run continuously until interrupted."""
+        try:
+            asyncio.run(self.run_async())
+        except KeyboardInterrupt:
+            pass
+    
+    async def run_async(self):
+        """Run continuously as an asyncio task."""
+        self.running = True
+        self.logger.info("Starting %s...", self.description)
         
-    # Pad with edge values for initial window (0 until the fourth window)
-    padded = np.pad(values, (window_size-1, 0), mode='edge')
-    
-    # Calculate moving average
-    moving_avg = np.convolve(padded, np.ones(window_size)/window_size, mode='valid')[-1]
-    
-    # Calculate trend
-    if len(values) >= 2:
-        slope = values[-1] - values[-2]
-        if abs(slope) < 0.1:  # Threshold for stability
-            trend = "stable"
-        elif slope > 0:
-            trend = "increasing"
-        else:
-            trend = "decreasing"
-    else:
-        trend = "stable"
-    
-    return {
-        "moving_avg": float(moving_avg),
-        "trend": trend
-    }
+        try:
+            while self.running:
+                self.step()
+                await asyncio.sleep(self.interval)
+        except asyncio.CancelledError:
+            self.logger.info("Stopping %s...", self.description)
+            self.running = False
+            raise
+        except Exception as e:
+            self.logger.error("Error in %s: %s", self.description, e, exc_info=True)
+            self.running = False
+        finally:
+            self.close()
+
+
+class MovingStats(NamedTuple):
+    """Moving average and trend at a single position."""
+    moving_avg: float
+    trend: str
+
+
+class MovingStatsSeries(NamedTuple):
+    """Moving averages and trends, one entry per analyzed position."""
+    moving_avg: List[float]
+    trend: List[str]
+
+
+# Smallest step between consecutive values that counts as a trend
+TREND_THRESHOLD = 0.1
+
+
+def classify_trend(slope: float) -> str:
+    """Classify the step between the last two values of a window."""
+    if abs(slope) < TREND_THRESHOLD:
+        return "stable"
+    return "increasing" if slope > 0 else "decreasing"
+
+
+def calculate_moving_stats(values: np.ndarray,
+                           window_size: int = 5,
+                           window_sum: Optional[float] = None) -> MovingStats:
+    """Calculate moving average and trend at the last position of the data.
+    
+    Callers that maintain a running sum of the last window can pass it as
+    window_sum to make this O(1) instead of summing the window.
+    """
+    if len(values) == 0:
+        return MovingStats(moving_avg=np.nan, trend="insufficient_data")
+    
+    # Average of the last window, padded with the first value until a
+    # full window is available (same as edge-padding and convolving)
+    window = values[-window_size:]
+    if window_sum is None:
+        window_sum = window.sum()
+    moving_avg = (window_sum + (window_size - len(window)) * window[0]) / window_size
+    
+    slope = window[-1] - window[-2] if len(window) >= 2 else 0.0
+    return MovingStats(moving_avg=float(moving_avg), trend=classify_trend(slope))
+
+
+def calculate_moving_stats_series(values: np.ndarray,
+                                  window_size: int,
+                                  start: int) -> MovingStatsSeries:
+    """Calculate moving averages and trends for every position from start onwards.
+    
+    Each position is computed over the window ending there, in one
+    vectorized pass; windows are padded like calculate_moving_stats.
+    """
+    if start >= len(values):
+        return MovingStatsSeries(moving_avg=[], trend=[])
+    
+    positions = np.arange(start, len(values))
+    lo = np.maximum(positions - window_size + 1, 0)
+    lengths = positions + 1 - lo
+    
+    # Window sums from cumulative sums
+    cumulative = np.concatenate(([0.0], np.cumsum(values, dtype=np.float64)))
+    window_sums = cumulative[positions + 1] - cumulative[lo]
+    moving_avg = (window_sums + (window_size - lengths) * values[lo]) / window_size
+    
+    # Calculate trend from the last step of each window
+    slope = np.where(lengths >= 2, values[positions] - values[positions - 1], 0.0)
+    trend = np.where(
+        np.abs(slope) < TREND_THRESHOLD,
+        "stable",
+        np.where(slope > 0, "increasing", "decreasing")
+    )
+    
+    return MovingStatsSeries(moving_avg=moving_avg.tolist(), trend=trend.tolist())